@@ -3,14 +3,23 @@
 Calendar CLI - Command-line interface for calendar operations
 """
 
-import argparse
+import os
+import sys
 from datetime import datetime, timedelta
-from calendar_manager import CalendarManager, EventStatus, EventColor
+from functools import lru_cache
+from types import SimpleNamespace
+
+# calendar_manager (and the Google client stack behind it) is imported inside
+# the handlers so that --help and daemon-served commands start instantly
 
 def format_time(dt: datetime) -> str:
     """Format datetime to readable time string"""
-    return dt.strftime("%-I:%M %p")
+    # Plain arithmetic instead of strftime, which re-parses its format
+    # string (through locale-aware C code) on every event printed
+    hour = dt.hour
+    return f"{hour % 12 or 12}:{dt.minute:02d} {'AM' if hour < 12 else 'PM'}"
 
+@lru_cache(maxsize=None)
 def format_duration(minutes: int) -> str:
     """Format duration in minutes to readable string"""
     hours = minutes // 60
@@ -19,9 +28,10 @@ def format_duration(minutes: int) -> str:
         return f"{hours}h {mins}m" if mins > 0 else f"{hours}h"
     return f"{mins}m"
 
-def cmd_today(args):
+def cmd_today(manager, args):
     """Show today's calendar"""
-    manager = CalendarManager()
+    from calendar_manager import EventStatus
+
     events = manager.get_today_events(include_declined=args.all)
     
     if not events:
@@ -49,9 +59,8 @@ def cmd_today(args):
         if event.has_meeting_link:
             print(f"   🔗 Virtual Meeting")
 
-def cmd_analyze(args):
+def cmd_analyze(manager, args):
     """Analyze schedule and show insights"""
-    manager = CalendarManager()
     analysis = manager.analyze_schedule()
     
     print("\n📊 Schedule Analysis")
@@ -68,9 +77,8 @@ def cmd_analyze(args):
             duration = int((end - start).total_seconds() / 60)
             print(f"   {format_time(start)} - {format_time(end)} ({format_duration(duration)})")
 
-def cmd_rank(args):
+def cmd_rank(manager, args):
     """Stack rank meetings by importance"""
-    manager = CalendarManager()
     rankings = manager.stack_rank_meetings()
     
     print("\n📊 Meeting Priority Rankings")
@@ -89,9 +97,8 @@ def cmd_rank(args):
             for event in events:
                 print(f"   • {format_time(event.start)} - {event.title}")
 
-def cmd_decline(args):
+def cmd_decline(manager, args):
     """Decline a meeting"""
-    manager = CalendarManager()
     event = manager.find_event_by_title(args.title)
     
     if not event:
@@ -106,9 +113,8 @@ def cmd_decline(args):
     else:
         print(f"❌ Failed to decline event")
 
-def cmd_reschedule(args):
+def cmd_reschedule(manager, args):
     """Reschedule a meeting"""
-    manager = CalendarManager()
     event = manager.find_event_by_title(args.title)
     
     if not event:
@@ -133,9 +139,8 @@ def cmd_reschedule(args):
     if args.message:
         print(f"   Message: {args.message}")
 
-def cmd_focus(args):
+def cmd_focus(manager, args):
     """Create a focus block"""
-    manager = CalendarManager()
     
     # Parse times
     today = datetime.now().date()
@@ -152,9 +157,8 @@ def cmd_focus(args):
     print(f"   Time: {format_time(event.start)} - {format_time(event.end)}")
     print(f"   Duration: {format_duration(duration)}")
 
-def cmd_commute(args):
+def cmd_commute(manager, args):
     """Create a commute block"""
-    manager = CalendarManager()
     
     # Parse times
     today = datetime.now().date()
@@ -169,7 +173,146 @@ def cmd_commute(args):
     print(f"✅ Commute block created")
     print(f"   Time: {format_time(event.start)} - {format_time(event.end)}")
 
+def cmd_warmup(args):
+    """Pre-compile the optional Numba kernels so first real use is fast"""
+    from calendar_manager import _load_free_blocks_kernel
+
+    kernel = _load_free_blocks_kernel()
+    if kernel is None:
+        print("⚠️  numba/numpy not installed - nothing to warm up")
+        return
+
+    import numpy as np
+    kernel(np.zeros(1, np.int64), np.ones(1, np.int64), 0, 86400, 1800)
+    print("✅ Numba kernels compiled and cached")
+
+COMMANDS = {
+    'today': cmd_today,
+    'analyze': cmd_analyze,
+    'rank': cmd_rank,
+    'decline': cmd_decline,
+    'reschedule': cmd_reschedule,
+    'focus': cmd_focus,
+    'commute': cmd_commute,
+}
+
+# Upper bound on waiting for the daemon to answer: a wedged daemon must
+# degrade to local execution, never hang the CLI
+DAEMON_REPLY_TIMEOUT = 30
+
+def _connect_to_daemon():
+    """Connect to the daemon socket, starting the daemon if needed"""
+    import socket
+    import subprocess
+    import sys
+    import time
+    from cal_daemon import SOCKET_PATH
+
+    def try_connect():
+        try:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        except (AttributeError, OSError):
+            # No SEQPACKET unix sockets on this platform (e.g. macOS) -
+            # report "no daemon" so commands run locally
+            return None
+        try:
+            sock.connect(str(SOCKET_PATH))
+        except OSError:
+            sock.close()
+            return None
+        sock.settimeout(DAEMON_REPLY_TIMEOUT)
+        return sock
+
+    sock = try_connect()
+    if sock:
+        return sock
+
+    # Don't spawn a daemon that could never be reached
+    try:
+        socket.socket(socket.AF_UNIX, socket.SOCK_SEQPACKET).close()
+    except (AttributeError, OSError):
+        return None
+
+    # Without a stored token the daemon would refuse to start (it can't
+    # run the interactive auth flow detached) - go straight to local
+    # execution so sign-in happens in the foreground
+    if not os.path.exists('token.json'):
+        return None
+
+    # No daemon running - start one and wait briefly for it to bind
+    daemon_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cal_daemon.py')
+    subprocess.Popen(
+        [sys.executable, daemon_path],
+        start_new_session=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    for _ in range(50):
+        time.sleep(0.1)
+        sock = try_connect()
+        if sock:
+            return sock
+    return None
+
+def run_via_daemon(command: str, args) -> bool:
+    """Send a command to the daemon; returns False if unavailable"""
+    from cal_daemon import MAX_MESSAGE_BYTES, dumps, loads
+
+    sock = _connect_to_daemon()
+    if not sock:
+        return False
+
+    try:
+        sock.sendall(dumps({'command': command, 'args': vars(args)}))
+        data = sock.recv(MAX_MESSAGE_BYTES)
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+    if not data:
+        return False
+
+    response = loads(data)
+    if response.get('output'):
+        print(response['output'], end='')
+    if not response.get('ok'):
+        print(f"❌ {response.get('error', 'Unknown daemon error')}")
+    return True
+
+# Bare single-word commands and their argument defaults: these skip argparse
+# construction entirely, which is a measurable slice of per-call startup
+_FAST_PATH_DEFAULTS = {
+    'today': {'all': False},
+    'analyze': {},
+    'rank': {},
+    'warmup': {},
+}
+
+def _dispatch(args):
+    """Run a parsed command via the daemon, falling back to local execution"""
+    # Warmup needs no calendar access, so never route it through the daemon
+    if args.command == 'warmup':
+        cmd_warmup(args)
+        return
+
+    # Prefer the daemon (single long-lived CalendarManager); fall back to
+    # constructing one locally if the daemon can't be reached
+    if run_via_daemon(args.command, args):
+        return
+
+    from calendar_manager import CalendarManager
+
+    manager = CalendarManager()
+    COMMANDS[args.command](manager, args)
+
 def main():
+    if len(sys.argv) == 2 and sys.argv[1] in _FAST_PATH_DEFAULTS:
+        _dispatch(SimpleNamespace(command=sys.argv[1], **_FAST_PATH_DEFAULTS[sys.argv[1]]))
+        return
+
+    import argparse
+
     parser = argparse.ArgumentParser(description='Calendar Management CLI')
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
     
@@ -207,25 +350,17 @@ def main():
     commute_parser.add_argument('start', help='Start time (HH:MM)')
     commute_parser.add_argument('end', help='End time (HH:MM)')
     commute_parser.add_argument('--description', default='Travel time', help='Commute description')
-    
+
+    # Warmup command
+    subparsers.add_parser('warmup', help='Pre-compile accelerated kernels (run once after install)')
+
     args = parser.parse_args()
-    
+
     if not args.command:
         parser.print_help()
         return
-    
-    # Execute command
-    commands = {
-        'today': cmd_today,
-        'analyze': cmd_analyze,
-        'rank': cmd_rank,
-        'decline': cmd_decline,
-        'reschedule': cmd_reschedule,
-        'focus': cmd_focus,
-        'commute': cmd_commute,
-    }
-    
-    commands[args.command](args)
+
+    _dispatch(args)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
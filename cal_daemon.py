@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Calendar Daemon - Long-running server that keeps a single CalendarManager alive
+
+Repeated CLI invocations normally pay for token loading, discovery-document
+building, and a TLS handshake on every command. The daemon pays these costs
+once, then serves commands over a Unix domain socket in a few milliseconds.
+"""
+
+import argparse
+import io
+import os
+import socket
+import sys
+from contextlib import redirect_stdout
+from pathlib import Path
+
+SOCKET_PATH = Path.home() / '.cal-agent.sock'
+MAX_MESSAGE_BYTES = 1024 * 1024
+
+# orjson decodes/encodes the socket frames several times faster than stdlib
+# json; fall back silently when it isn't installed
+try:
+    import orjson
+
+    def dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+
+    loads = orjson.loads
+except ImportError:
+    import json
+
+    def dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+    loads = json.loads
+
+def pack_events(events) -> dict:
+    """Encode CalendarEvents as columnar arrays for the socket
+
+    Struct-of-arrays beats a list of per-event dicts on the wire: the JSON
+    codec encodes flat string/primitive columns far faster, timestamps pack
+    into base64'd int64 arrays, and status/flags into one byte per event.
+    Attendees/location/description are omitted - this is the analysis shape.
+    """
+    from array import array
+    from base64 import b64encode
+
+    from calendar_manager import EventStatus
+
+    status_code = {status: i for i, status in enumerate(EventStatus)}
+    return {
+        'ids': [e.id for e in events],
+        'titles': [e.title for e in events],
+        'starts': b64encode(array('q', (int(e.start.timestamp()) for e in events)).tobytes()).decode(),
+        'ends': b64encode(array('q', (int(e.end.timestamp()) for e in events)).tobytes()).decode(),
+        'status': b64encode(bytes(status_code[e.status] for e in events)).decode(),
+        'flags': b64encode(bytes(e.has_meeting_link for e in events)).decode(),
+    }
+
+def unpack_events(batch: dict) -> list:
+    """Decode a pack_events() payload back into CalendarEvent objects"""
+    from array import array
+    from base64 import b64decode
+    from datetime import datetime
+
+    from calendar_manager import CalendarEvent, CalendarManager, EventStatus
+
+    ist = CalendarManager.IST
+    statuses = list(EventStatus)
+    starts = array('q')
+    starts.frombytes(b64decode(batch['starts']))
+    ends = array('q')
+    ends.frombytes(b64decode(batch['ends']))
+    status = b64decode(batch['status'])
+    flags = b64decode(batch['flags'])
+
+    return [
+        CalendarEvent(
+            id=event_id,
+            title=title,
+            start=datetime.fromtimestamp(start, ist),
+            end=datetime.fromtimestamp(end, ist),
+            status=statuses[code],
+            has_meeting_link=bool(flag)
+        )
+        for event_id, title, start, end, code, flag
+        in zip(batch['ids'], batch['titles'], starts, ends, status, flags)
+    ]
+
+def handle_request(manager, payload: dict) -> dict:
+    """Execute a single CLI command against the shared manager"""
+    from cal_cli import COMMANDS
+
+    command = payload.get('command')
+
+    # Structured fetch for programmatic clients: returns today's events as
+    # columnar arrays instead of rendered text
+    if command == 'fetch_events':
+        args = payload.get('args', {})
+        try:
+            events = manager.get_today_events(include_declined=args.get('all', False))
+            return {'ok': True, 'events': pack_events(events)}
+        except Exception as e:
+            return {'ok': False, 'error': str(e)}
+
+    if command not in COMMANDS:
+        return {'ok': False, 'error': f"Unknown command: {command}"}
+
+    args = argparse.Namespace(**payload.get('args', {}))
+    output = io.StringIO()
+    try:
+        with redirect_stdout(output):
+            COMMANDS[command](manager, args)
+        return {'ok': True, 'output': output.getvalue()}
+    except Exception as e:
+        return {'ok': False, 'error': str(e), 'output': output.getvalue()}
+
+def _stored_token_usable() -> bool:
+    """True when token.json lets CalendarManager build without a browser flow"""
+    from google.oauth2.credentials import Credentials
+
+    from calendar_manager import CalendarManager
+
+    try:
+        creds = Credentials.from_authorized_user_file('token.json', CalendarManager.SCOPES)
+    except (OSError, ValueError):
+        return False
+    return creds.valid or bool(creds.expired and creds.refresh_token)
+
+def serve():
+    """Bind the socket and serve commands until killed"""
+    from calendar_manager import CalendarManager
+
+    # A detached daemon must never run the interactive OAuth flow: the
+    # auth URL would vanish into /dev/null while clients block on recv,
+    # and the bound socket would wedge every later invocation. Exit
+    # before binding instead, so the CLI falls back to a foreground
+    # CalendarManager that can walk the user through sign-in.
+    if not _stored_token_usable():
+        sys.exit(1)
+
+    if SOCKET_PATH.exists():
+        SOCKET_PATH.unlink()
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+    server.bind(str(SOCKET_PATH))
+    os.chmod(SOCKET_PATH, 0o600)
+    server.listen(5)
+
+    # Authenticate and build the service once for the daemon's lifetime
+    manager = CalendarManager()
+
+    try:
+        while True:
+            conn, _ = server.accept()
+            try:
+                data = conn.recv(MAX_MESSAGE_BYTES)
+                if not data:
+                    continue
+                response = handle_request(manager, loads(data))
+                conn.sendall(dumps(response))
+            except Exception as e:
+                try:
+                    conn.sendall(dumps({'ok': False, 'error': str(e)}))
+                except OSError:
+                    pass
+            finally:
+                conn.close()
+    finally:
+        server.close()
+        if SOCKET_PATH.exists():
+            SOCKET_PATH.unlink()
+
+if __name__ == '__main__':
+    serve()
@@ -3,16 +3,68 @@
 Calendar Manager - A high-level abstraction for Google Calendar operations
 """
 
+import functools
 import os
-import pickle
+import re
+import sys
+import time
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
-import pytz
-from google.auth.transport.requests import Request
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
+from zoneinfo import ZoneInfo
+
+# The Google client imports pull in hundreds of submodules, so they are
+# deferred to the methods that need them - commands that never touch the
+# network (or --help) don't pay for them at startup.
+
+# fromisoformat handles the 'Z' suffix natively on 3.11+; only older
+# interpreters need the per-string rewrite
+if sys.version_info >= (3, 11):
+    _parse_iso = datetime.fromisoformat
+else:
+    def _parse_iso(s: str) -> datetime:
+        return datetime.fromisoformat(s[:-1] + '+00:00' if s.endswith('Z') else s)
+
+# Gap scans over a handful of events are fine in Python; only long planning
+# horizons amortize NumPy/Numba dispatch (and first-call compile) overhead
+_VECTORIZE_MIN_EVENTS = 50
+
+# Single compiled scan per title for the block-type checks the analysis
+# loops evaluate on every event
+_FOCUS_RE = re.compile(r'Focus Block|🎯')
+_COMMUTE_RE = re.compile(r'Commute|🚗')
+
+@functools.cache
+def _load_free_blocks_kernel():
+    """Compile the Numba free-block kernel; None if numba/numpy are missing"""
+    try:
+        import numpy as np
+        from numba import njit
+    except ImportError:
+        return None
+
+    @njit(cache=True)
+    def kernel(starts, ends, work_start, work_end, min_gap):
+        n = starts.shape[0]
+        out = np.empty((n + 1, 2), dtype=np.int64)
+        count = 0
+        if starts[0] - work_start >= min_gap:
+            out[count, 0] = work_start
+            out[count, 1] = starts[0]
+            count += 1
+        for i in range(n - 1):
+            if starts[i + 1] - ends[i] >= min_gap:
+                out[count, 0] = ends[i]
+                out[count, 1] = starts[i + 1]
+                count += 1
+        if work_end - ends[n - 1] >= min_gap:
+            out[count, 0] = ends[n - 1]
+            out[count, 1] = work_end
+            count += 1
+        return out[:count]
+
+    return kernel
 
 class EventStatus(Enum):
     ACCEPTED = "accepted"
@@ -27,7 +79,7 @@ class EventColor(Enum):
     GREEN = "10"     # Available
     YELLOW = "5"     # Tentative
 
-@dataclass
+@dataclass(slots=True)
 class CalendarEvent:
     """Structured representation of a calendar event"""
     id: str
@@ -46,50 +98,105 @@ class CalendarEvent:
     
     @property
     def is_focus_block(self) -> bool:
-        return "Focus Block" in self.title or "🎯" in self.title
-    
+        return _FOCUS_RE.search(self.title) is not None
+
     @property
     def is_commute(self) -> bool:
-        return "Commute" in self.title or "🚗" in self.title
+        return _COMMUTE_RE.search(self.title) is not None
 
 class CalendarManager:
     """High-level calendar management interface"""
-    
+
+    # Partial-response mask: only the event attributes _parse_event reads.
+    # Shrinks list responses several-fold vs. the full event resource.
+    EVENT_FIELDS = 'id,summary,start,end,location,description,hangoutLink,attendees(self,responseStatus,email)'
+
     SCOPES = ['https://www.googleapis.com/auth/calendar']
-    IST = pytz.timezone('Asia/Kolkata')
-    
-    def __init__(self, credentials_path: str = 'credentials.json', token_path: str = 'token.pickle'):
+    IST = ZoneInfo('Asia/Kolkata')
+
+    # How long fetched event lists stay valid; writes invalidate immediately
+    EVENTS_CACHE_TTL = 60
+
+    # Precompiled keyword alternations for meeting ranking: one C-level
+    # regex scan per title instead of a Python-level `in` test per keyword
+    _CRITICAL_RE = re.compile(r'production|deploy|leads|epd|gtm|critical|urgent')
+    _IMPORTANT_RE = re.compile(r'daily|migration|customer|onboarding|1:1|weekly')
+    _MODERATE_RE = re.compile(r'sync|catch|check')
+    _CANCELABLE_RE = re.compile(r'list')
+
+    def __init__(self, credentials_path: str = 'credentials.json', token_path: str = 'token.json',
+                 credentials: Optional[Dict] = None):
         self.credentials_path = credentials_path
         self.token_path = token_path
+        # An already-parsed client config (e.g. from setup.py, which reads
+        # credentials.json for validation anyway) skips a second file read
+        self._client_config = credentials
         self.service = None
+        self._events_cache = {}
+        self._my_email = None
         self._initialize_service()
     
     def _initialize_service(self):
         """Initialize Google Calendar service with authentication"""
+        import google_auth_httplib2
+        import httplib2
+        from googleapiclient.discovery import build
+
         creds = self._get_credentials()
-        self.service = build('calendar', 'v3', credentials=creds)
-    
+        # One authorized client with keep-alive, reused across every API
+        # call, so back-to-back requests (get+patch, list pages) share a
+        # single TCP/TLS connection. static_discovery avoids fetching the
+        # discovery document over the network.
+        http = google_auth_httplib2.AuthorizedHttp(creds, http=httplib2.Http(timeout=10))
+        self.service = build(
+            'calendar', 'v3',
+            http=http,
+            cache_discovery=False,
+            static_discovery=True
+        )
+
     def _get_credentials(self):
         """Handle OAuth2 authentication and token management"""
+        from google.auth.transport.requests import Request
+        from google.oauth2.credentials import Credentials
+        from google_auth_oauthlib.flow import InstalledAppFlow
+
         creds = None
-        
+
         if os.path.exists(self.token_path):
-            with open(self.token_path, 'rb') as token:
-                creds = pickle.load(token)
-        
+            creds = Credentials.from_authorized_user_file(self.token_path, self.SCOPES)
+        else:
+            # Migrate a token stored by older versions, which pickled the
+            # whole Credentials object (slower to load and unsafe to parse)
+            legacy_path = 'token.pickle'
+            if os.path.exists(legacy_path):
+                import pickle
+                with open(legacy_path, 'rb') as token:
+                    creds = pickle.load(token)
+                self._save_credentials(creds)
+                os.remove(legacy_path)
+
         if not creds or not creds.valid:
             if creds and creds.expired and creds.refresh_token:
                 creds.refresh(Request())
             else:
-                if not os.path.exists(self.credentials_path):
+                if self._client_config is not None:
+                    flow = InstalledAppFlow.from_client_config(self._client_config, self.SCOPES)
+                elif os.path.exists(self.credentials_path):
+                    flow = InstalledAppFlow.from_client_secrets_file(self.credentials_path, self.SCOPES)
+                else:
                     raise FileNotFoundError(f'{self.credentials_path} not found. Please set up Google Calendar API credentials.')
-                flow = InstalledAppFlow.from_client_secrets_file(self.credentials_path, self.SCOPES)
                 creds = flow.run_local_server(port=0)
-            
-            with open(self.token_path, 'wb') as token:
-                pickle.dump(creds, token)
-        
+
+            self._save_credentials(creds)
+
         return creds
+
+    def _save_credentials(self, creds):
+        """Persist credentials as JSON, readable only by the owner"""
+        fd = os.open(self.token_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as token:
+            token.write(creds.to_json())
     
     def get_today_events(self, include_declined: bool = False) -> List[CalendarEvent]:
         """Fetch all events for today"""
@@ -104,22 +211,55 @@ class CalendarManager:
         return self.get_events_in_range(start_of_day, end_of_day, include_declined)
     
     def get_events_in_range(self, start: datetime, end: datetime, include_declined: bool = False) -> List[CalendarEvent]:
-        """Fetch events within a time range"""
-        events_result = self.service.events().list(
-            calendarId='primary',
-            timeMin=start.isoformat(),
-            timeMax=end.isoformat(),
-            singleEvents=True,
-            orderBy='startTime'
-        ).execute()
-        
+        """Fetch events within a time range (cached for EVENTS_CACHE_TTL seconds)"""
+        cache_key = (start.isoformat(), end.isoformat(), include_declined)
+        cached = self._events_cache.get(cache_key)
+        if cached is not None:
+            fetched_at, events = cached
+            if time.monotonic() - fetched_at < self.EVENTS_CACHE_TTL:
+                return events
+
         events = []
-        for event_data in events_result.get('items', []):
+        for event_data in self._iter_event_items(start, end):
             event = self._parse_event(event_data)
             if include_declined or event.status != EventStatus.DECLINED:
                 events.append(event)
-        
+
+        self._events_cache[cache_key] = (time.monotonic(), events)
         return events
+
+    def _iter_event_items(self, start: datetime, end: datetime):
+        """Yield raw event dicts across all result pages
+
+        Long ranges span multiple pages; the next page is requested on a
+        worker thread while the current page's items are being parsed, so
+        network round-trips overlap with parse time.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        def fetch(page_token):
+            return self.service.events().list(
+                calendarId='primary',
+                timeMin=start.isoformat(),
+                timeMax=end.isoformat(),
+                singleEvents=True,
+                orderBy='startTime',
+                maxResults=2500,
+                pageToken=page_token,
+                fields=f'nextPageToken,items({self.EVENT_FIELDS})'
+            ).execute()
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            future = pool.submit(fetch, None)
+            while future is not None:
+                page = future.result()
+                next_token = page.get('nextPageToken')
+                future = pool.submit(fetch, next_token) if next_token else None
+                yield from page.get('items', [])
+
+    def _invalidate_events_cache(self):
+        """Drop cached event lists after any write to the calendar"""
+        self._events_cache.clear()
     
     def _parse_event(self, event_data: Dict) -> CalendarEvent:
         """Parse Google Calendar event data into CalendarEvent object"""
@@ -127,12 +267,17 @@ class CalendarManager:
         start_str = event_data['start'].get('dateTime', event_data['start'].get('date'))
         end_str = event_data['end'].get('dateTime', event_data['end'].get('date'))
         
+        ist = self.IST
         if 'T' in start_str:
-            start_dt = datetime.fromisoformat(start_str.replace('Z', '+00:00')).astimezone(self.IST)
-            end_dt = datetime.fromisoformat(end_str.replace('Z', '+00:00')).astimezone(self.IST)
+            start_dt = _parse_iso(start_str)
+            end_dt = _parse_iso(end_str)
+            # Skip the conversion when the server already sent IST offsets
+            if not start_str.endswith('+05:30'):
+                start_dt = start_dt.astimezone(ist)
+                end_dt = end_dt.astimezone(ist)
         else:
-            start_dt = datetime.fromisoformat(start_str).replace(tzinfo=self.IST)
-            end_dt = datetime.fromisoformat(end_str).replace(tzinfo=self.IST)
+            start_dt = _parse_iso(start_str).replace(tzinfo=ist)
+            end_dt = _parse_iso(end_str).replace(tzinfo=ist)
         
         # Get my response status
         status = EventStatus.ACCEPTED
@@ -195,6 +340,7 @@ class CalendarManager:
             event_body['colorId'] = color.value
         
         created_event = self.service.events().insert(calendarId='primary', body=event_body).execute()
+        self._invalidate_events_cache()
         return self._parse_event(created_event)
     
     def create_focus_block(self, 
@@ -223,28 +369,124 @@ class CalendarManager:
             reminder_minutes=10
         )
     
+    def ping(self) -> bool:
+        """Cheap connectivity probe
+
+        Fetches a single calendarList field (~1 KB) instead of a full
+        day's events, so setup checks stay O(1) on busy calendars.
+        """
+        self._get_my_email()
+        return True
+
+    def _get_my_email(self) -> str:
+        """Email of the authenticated user (the primary calendar id), cached"""
+        if self._my_email is None:
+            calendar = self.service.calendarList().get(calendarId='primary', fields='id').execute()
+            self._my_email = calendar['id']
+        return self._my_email
+
     def update_event_status(self, event_id: str, new_status: EventStatus, send_notification: bool = True) -> bool:
         """Update your response status for an event"""
+        send_updates = 'all' if send_notification else 'none'
+
+        # Patch replaces the attendees array wholesale - it does not merge
+        # entries by email - so a single-entry body would wipe every other
+        # attendee off any event the user organizes. The preceding get is
+        # mandatory; patch still beats update by not resending the rest of
+        # the resource.
         try:
-            event = self.service.events().get(calendarId='primary', eventId=event_id).execute()
-            
+            # Full attendee objects, not the list-shaped sub-mask: the list
+            # is patched back, and a masked fetch would strip fields like
+            # optional/comment/displayName from everyone on the event
+            event = self.service.events().get(
+                calendarId='primary',
+                eventId=event_id,
+                fields='attendees'
+            ).execute()
+
             attendees = event.get('attendees', [])
             for attendee in attendees:
                 if attendee.get('self', False):
                     attendee['responseStatus'] = new_status.value
                     break
-            
+
             self.service.events().patch(
                 calendarId='primary',
                 eventId=event_id,
                 body={'attendees': attendees},
-                sendUpdates='all' if send_notification else 'none'
+                sendUpdates=send_updates
             ).execute()
+            self._invalidate_events_cache()
             return True
         except Exception as e:
             print(f"Error updating event status: {e}")
             return False
     
+    def batch_update_status(self, updates: List[Tuple[str, EventStatus]], send_notification: bool = True) -> Dict[str, bool]:
+        """Update response status for many events in two HTTP round-trips
+
+        One batched get collects attendee lists, one batched patch applies
+        the new statuses - N updates cost 2 round-trips instead of 2*N.
+        Returns a map of event_id -> success.
+        """
+        if not updates:
+            return {}
+
+        fetched = {}
+
+        def on_get(request_id, response, exception):
+            if exception is None:
+                fetched[request_id] = response.get('attendees', [])
+
+        # Unmasked attendee objects: these lists are patched back verbatim,
+        # and patch replaces the array, so a sub-field mask here would strip
+        # attendee metadata across every organizer-owned event in the batch
+        get_batch = self.service.new_batch_http_request(callback=on_get)
+        for event_id, _ in updates:
+            get_batch.add(
+                self.service.events().get(
+                    calendarId='primary',
+                    eventId=event_id,
+                    fields='attendees'
+                ),
+                request_id=event_id
+            )
+        get_batch.execute()
+
+        results = {event_id: False for event_id, _ in updates}
+
+        def on_patch(request_id, response, exception):
+            results[request_id] = exception is None
+            if exception:
+                print(f"Error updating event status: {exception}")
+
+        patch_batch = self.service.new_batch_http_request(callback=on_patch)
+        queued = False
+        for event_id, new_status in updates:
+            attendees = fetched.get(event_id)
+            if attendees is None:
+                continue
+            for attendee in attendees:
+                if attendee.get('self', False):
+                    attendee['responseStatus'] = new_status.value
+                    break
+            patch_batch.add(
+                self.service.events().patch(
+                    calendarId='primary',
+                    eventId=event_id,
+                    body={'attendees': attendees},
+                    sendUpdates='all' if send_notification else 'none'
+                ),
+                request_id=event_id
+            )
+            queued = True
+
+        if queued:
+            patch_batch.execute()
+            self._invalidate_events_cache()
+
+        return results
+
     def decline_event(self, event_id: str, send_notification: bool = True) -> bool:
         """Decline a calendar event"""
         return self.update_event_status(event_id, EventStatus.DECLINED, send_notification)
@@ -271,7 +513,8 @@ class CalendarManager:
             body=event,
             sendUpdates='all' if send_notification else 'none'
         ).execute()
-        
+
+        self._invalidate_events_cache()
         return self._parse_event(updated_event)
     
     def find_event_by_title(self, title_substring: str, date=None) -> Optional[CalendarEvent]:
@@ -283,17 +526,26 @@ class CalendarManager:
                 return event
         return None
     
-    def analyze_schedule(self, date=None) -> Dict:
+    def analyze_schedule(self, date=None, events: List[CalendarEvent] = None) -> Dict:
         """Analyze schedule and provide insights"""
-        events = self.get_today_events() if date is None else self.get_events_for_date(date)
-        
-        total_meetings = len([e for e in events if not e.is_focus_block and not e.is_commute])
-        total_focus_time = sum([e.duration_minutes for e in events if e.is_focus_block])
-        total_meeting_time = sum([e.duration_minutes for e in events if not e.is_focus_block and not e.is_commute])
+        if events is None:
+            events = self.get_today_events() if date is None else self.get_events_for_date(date)
         
-        # Find free blocks
+        # Single pass: classify each event once and accumulate all totals
+        total_meetings = 0
+        total_focus_time = 0
+        total_meeting_time = 0
+        for event in events:
+            if event.is_focus_block:
+                total_focus_time += event.duration_minutes
+            elif not event.is_commute:
+                total_meetings += 1
+                total_meeting_time += event.duration_minutes
+
+        # Sort once and share the ordered list between both gap scans
+        events = sorted(events, key=lambda e: e.start)
         free_blocks = self._find_free_blocks(events)
-        
+
         return {
             'total_events': len(events),
             'total_meetings': total_meetings,
@@ -304,15 +556,34 @@ class CalendarManager:
         }
     
     def _find_free_blocks(self, events: List[CalendarEvent], min_duration_minutes: int = 30) -> List[Tuple[datetime, datetime]]:
-        """Find free time blocks in schedule"""
+        """Find free time blocks in a schedule (events must be sorted by start)"""
         if not events:
             return []
-        
-        events = sorted(events, key=lambda e: e.start)
+
+        now = datetime.now(self.IST)
+        work_start = now.replace(hour=9, minute=0, second=0, microsecond=0)
+        work_end = now.replace(hour=22, minute=0, second=0, microsecond=0)
+
+        if len(events) >= _VECTORIZE_MIN_EVENTS:
+            kernel = _load_free_blocks_kernel()
+            if kernel is not None:
+                import numpy as np
+                starts = np.array([int(e.start.timestamp()) for e in events], dtype=np.int64)
+                ends = np.array([int(e.end.timestamp()) for e in events], dtype=np.int64)
+                pairs = kernel(
+                    starts, ends,
+                    int(work_start.timestamp()),
+                    int(work_end.timestamp()),
+                    min_duration_minutes * 60
+                )
+                return [
+                    (datetime.fromtimestamp(s, self.IST), datetime.fromtimestamp(e, self.IST))
+                    for s, e in pairs
+                ]
+
         free_blocks = []
-        
+
         # Check time before first event
-        work_start = datetime.now(self.IST).replace(hour=9, minute=0, second=0, microsecond=0)
         if events[0].start > work_start:
             duration = (events[0].start - work_start).total_seconds() / 60
             if duration >= min_duration_minutes:
@@ -327,7 +598,6 @@ class CalendarManager:
                 free_blocks.append((gap_start, gap_end))
         
         # Check time after last event
-        work_end = datetime.now(self.IST).replace(hour=22, minute=0, second=0, microsecond=0)
         if events[-1].end < work_end:
             duration = (work_end - events[-1].end).total_seconds() / 60
             if duration >= min_duration_minutes:
@@ -336,11 +606,21 @@ class CalendarManager:
         return free_blocks
     
     def _count_back_to_back(self, events: List[CalendarEvent]) -> int:
-        """Count back-to-back meetings (less than 15 min gap)"""
+        """Count back-to-back meetings, i.e. less than 15 min gap (events must be sorted by start)"""
         if len(events) < 2:
             return 0
-        
-        events = sorted(events, key=lambda e: e.start)
+
+        if len(events) >= _VECTORIZE_MIN_EVENTS:
+            try:
+                import numpy as np
+            except ImportError:
+                pass
+            else:
+                # One SIMD pass: gap[i] = start[i+1] - end[i] in epoch seconds
+                starts = np.array([int(e.start.timestamp()) for e in events], dtype=np.int64)
+                ends = np.array([int(e.end.timestamp()) for e in events], dtype=np.int64)
+                return int(((starts[1:] - ends[:-1]) < 900).sum())
+
         count = 0
         
         for i in range(len(events) - 1):
@@ -365,18 +645,18 @@ class CalendarManager:
         
         for meeting in meetings:
             title_lower = meeting.title.lower()
-            
+
             # Critical indicators
-            if any(word in title_lower for word in ['production', 'deploy', 'leads', 'epd', 'gtm', 'critical', 'urgent']):
+            if self._CRITICAL_RE.search(title_lower):
                 critical.append(meeting)
             # Important indicators
-            elif any(word in title_lower for word in ['daily', 'migration', 'customer', 'onboarding', '1:1', 'weekly']):
+            elif self._IMPORTANT_RE.search(title_lower):
                 important.append(meeting)
             # Generic sync indicators
-            elif any(word in title_lower for word in ['sync', 'catch', 'check']):
+            elif self._MODERATE_RE.search(title_lower):
                 moderate.append(meeting)
             # Short meetings or lists
-            elif meeting.duration_minutes <= 30 or 'list' in title_lower:
+            elif meeting.duration_minutes <= 30 or self._CANCELABLE_RE.search(title_lower):
                 cancelable.append(meeting)
             else:
                 moderate.append(meeting)